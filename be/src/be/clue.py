@@ -0,0 +1,73 @@
+from functools import cache
+from string import ascii_uppercase
+from typing import Iterable, Iterator
+
+from .corpus import english
+
+ALL_LETTERS = (1 << len(ascii_uppercase)) - 1
+
+
+def letter_mask(letters: Iterable[str]) -> int:
+    """Bitmask of the distinct letters A-Z in `letters`; anything else is ignored."""
+    mask = 0
+    for letter in letters:
+        if "A" <= letter <= "Z":
+            mask |= 1 << (ord(letter) - ord("A"))
+    return mask
+
+
+def _submasks(mask: int) -> Iterator[int]:
+    """All submasks of `mask`, including `mask` itself and 0."""
+    submask = mask
+    while True:
+        yield submask
+        if submask == 0:
+            return
+        submask = (submask - 1) & mask
+
+
+class ClueIndex:
+    """Index of a corpus keyed by the set of distinct letters in each word.
+
+    Visible letters can be reused any number of times in a clue, so a word is
+    spellable exactly when its letter set is a subset of the visible letters.
+    The wild can stand in for one additional letter.
+    """
+
+    def __init__(self, corpus: Iterable[str]) -> None:
+        self._words_by_mask = dict[int, list[str]]()
+        for word in corpus:
+            self._words_by_mask.setdefault(letter_mask(word), []).append(word)
+
+    def _masks(self, visible: int, wild: bool) -> Iterator[int]:
+        # Enumerating submasks is cheap for the handful of letters visible in a
+        # real game; fall back to scanning the index for very large inputs.
+        subset_count = 1 << visible.bit_count()
+        if wild:
+            subset_count *= 1 + len(ascii_uppercase) - visible.bit_count()
+        if subset_count > len(self._words_by_mask):
+            for mask in self._words_by_mask:
+                if (mask & ~visible).bit_count() <= int(wild):
+                    yield mask
+            return
+
+        missing = ALL_LETTERS & ~visible
+        for submask in _submasks(visible):
+            yield submask
+            if not wild:
+                continue
+            extra = missing
+            while extra:
+                bit = extra & -extra
+                yield submask | bit
+                extra ^= bit
+
+    def spellable(self, letters: Iterable[str], wild: bool = False) -> Iterator[str]:
+        """Words spellable from `letters`, plus one wild letter if `wild` is set."""
+        for mask in self._masks(letter_mask(letters), wild):
+            yield from self._words_by_mask.get(mask, [])
+
+
+@cache
+def english_index() -> ClueIndex:
+    return ClueIndex(english())
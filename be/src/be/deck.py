@@ -1,6 +1,5 @@
 from collections import Counter
-from itertools import combinations
-from random import shuffle
+from random import Random
 
 DEFAULT_DECK = {
     "A": 4,
@@ -27,11 +26,11 @@ DEFAULT_DECK = {
 }
 
 
-def new_deck() -> list[str]:
+def new_deck(rng: Random | None = None) -> list[str]:
     deck = list[str]()
     for letter, count in DEFAULT_DECK.items():
         deck.extend([letter] * count)
-    shuffle(deck)
+    (rng or Random()).shuffle(deck)
     return deck
 
 
@@ -39,24 +38,59 @@ class NoPossibleCombinationError(ValueError):
     pass
 
 
+class DeckExhaustedError(IndexError):
+    pass
+
+
+def draw(deck: list[str]) -> str:
+    if not deck:
+        raise DeckExhaustedError("No cards left in the deck.")
+    return deck.pop()
+
+
+def _first_combination(
+    corpus: list[str], num_words: int, available_letters: Counter[str], start: int = 0
+) -> list[str] | None:
+    """First combination of `num_words` words from `corpus[start:]` that fits in
+    `available_letters`, in the same order as `itertools.combinations`.
+
+    Unlike filtering `combinations`, prefixes that already don't fit are pruned.
+    """
+    if num_words == 0:
+        return []
+    for i in range(start, len(corpus) - num_words + 1):
+        required_letters = Counter[str](corpus[i])
+        if not required_letters <= available_letters:
+            continue
+        rest = _first_combination(
+            corpus, num_words - 1, available_letters - required_letters, i + 1
+        )
+        if rest is not None:
+            return [corpus[i]] + rest
+    return None
+
+
 def deal_words(
-    deck: list[str], corpus: set[str], num_words: int, word_length: int
+    deck: list[str],
+    corpus: set[str],
+    num_words: int,
+    word_length: int,
+    rng: Random | None = None,
 ) -> list[str]:
     available_letters = Counter[str](deck)
 
-    # Filter corpus down to words of the correct length
-    filtered_corpus = [word for word in corpus if len(word) == word_length]
-    shuffle(filtered_corpus)
+    # Filter corpus down to words of the correct length. Sorted first so that the
+    # shuffle doesn't depend on set iteration order, which varies between runs.
+    filtered_corpus = sorted(word for word in corpus if len(word) == word_length)
+    (rng or Random()).shuffle(filtered_corpus)
 
-    for words in combinations(filtered_corpus, num_words):
-        required_letters = Counter[str]("".join(words))
-        if required_letters <= available_letters:
-            break
-    else:
+    words = _first_combination(filtered_corpus, num_words, available_letters)
+    if words is None:
         raise NoPossibleCombinationError("Could not find a valid combination of words.")
+    required_letters = Counter[str]("".join(words))
 
     # Remove the used letters from the deck. O(n^2), but at this scale it's okay.
     to_pop = list("".join(letter * count for letter, count in required_letters.items()))
     while to_pop:
         deck.remove(to_pop.pop())
-    return list(words)
+    return words
@@ -0,0 +1,143 @@
+import atexit
+import json
+import logging
+from copy import copy
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+_started_listeners = set[QueueListener]()
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as a single line of JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting tracebacks to the listener thread.
+
+    The stock `prepare` formats the whole record, traceback included, before
+    queueing it and then drops `exc_info`. Here only the message is resolved,
+    since its arguments may change once the logging call returns.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+@dataclass
+class _Window:
+    start: float
+    passed: int = 0
+    dropped: int = 0
+
+
+class RateLimitFilter(logging.Filter):
+    """Lets through at most `burst` records per message per `period` seconds.
+
+    Only records from the logger `name` and its children, at `max_level` or
+    below, are limited. Records are keyed by logger and unformatted message, so
+    each hot-path message is limited independently. Once a window in which
+    records were dropped has ended, the number dropped is logged when the next
+    record of any kind passes through the filter.
+    """
+
+    def __init__(
+        self,
+        name: str = "",
+        burst: int = 1,
+        period: float = 1.0,
+        max_level: int | str = logging.INFO,
+    ) -> None:
+        super().__init__(name)
+        self.burst = burst
+        self.period = period
+        if isinstance(max_level, str):
+            max_level = logging.getLevelNamesMapping()[max_level]
+        self.max_level = max_level
+        self._lock = Lock()
+        self._windows = dict[tuple[str, object], _Window]()
+        self._dropped = set[tuple[str, object]]()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        now = monotonic()
+        if self._dropped:
+            self._report_dropped(now)
+        if record.levelno > self.max_level or not super().filter(record):
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            window = self._windows.setdefault(key, _Window(now))
+            if now - window.start >= self.period:
+                window.start = now
+                window.passed = 0
+            if window.passed >= self.burst:
+                window.dropped += 1
+                self._dropped.add(key)
+                return False
+            window.passed += 1
+        return True
+
+    def _report_dropped(self, now: float) -> None:
+        reports = list[tuple[str, object, int]]()
+        with self._lock:
+            for key in list(self._dropped):
+                window = self._windows[key]
+                if now - window.start < self.period:
+                    continue
+                reports.append((*key, window.dropped))
+                window.dropped = 0
+                self._dropped.discard(key)
+        # Logged outside the lock, as these records pass through this filter too.
+        for name, msg, dropped in reports:
+            logging.getLogger(name).info("Dropped %d repeats of %r", dropped, msg)
+
+
+def start_queue_listeners() -> None:
+    """Starts the listeners of queue handlers created by `logging.config`.
+
+    `dictConfig` creates a listener for each `QueueHandler` but leaves starting
+    it to the application. Listeners are stopped at exit so that queued records
+    are flushed.
+    """
+    loggers = [logging.getLogger()] + [
+        logger
+        for logger in logging.Logger.manager.loggerDict.values()
+        if isinstance(logger, logging.Logger)
+    ]
+    for logger in loggers:
+        for handler in logger.handlers:
+            listener = getattr(handler, "listener", None)
+            if not isinstance(handler, QueueHandler) or listener is None:
+                continue
+            if listener in _started_listeners:
+                continue
+            if not _started_listeners:
+                atexit.register(stop_queue_listeners)
+            listener.start()
+            _started_listeners.add(listener)
+
+
+def stop_queue_listeners() -> None:
+    """Stops the listeners started by `start_queue_listeners`, flushing them."""
+    while _started_listeners:
+        _started_listeners.pop().stop()
@@ -1,37 +1,97 @@
+import asyncio
 import logging
+import os
+import secrets
 from collections import Counter
 from contextlib import asynccontextmanager
-from random import shuffle
+from random import Random
 from typing import Annotated, AsyncIterator, Literal, TypeAlias
 
 import coolname
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import (
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.encoders import jsonable_encoder
+from fastapi.responses import PlainTextResponse
 from fastapi_camelcase import CamelModel
 from pydantic import Field
 from rich.logging import RichHandler
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from . import profiling
+from .clue import english_index
 from .corpus import english
-from .deck import deal_words, new_deck
+from .deck import deal_words, draw, new_deck
+from .logs import start_queue_listeners
+from .profiling import profile
 
 logger = logging.getLogger(__name__)
 
+# Set to "0" to skip warming up at startup, e.g. for fast reloads in development.
+WARM_UP = os.environ.get("BE_WARM_UP", "1") != "0"
+
+# Token required by the admin endpoints, which are disabled if it is unset.
+ADMIN_TOKEN = os.environ.get("BE_ADMIN_TOKEN", "")
+
+ready = asyncio.Event()
+
+
+def warm_up() -> None:
+    """Pay one-off startup costs up front instead of on the first requests."""
+    english_index()
+    app.openapi()
+    game = Game(GameSettings(player_word_length=3))
+    for name in ("A", "B"):
+        game.players[name] = Player(name)
+    game.start()
+    jsonable_encoder(game.data, exclude_none=True)
+
+
+async def warm_up_in_background() -> None:
+    logger.info("Warming up.")
+    try:
+        await asyncio.to_thread(warm_up)
+    except Exception:
+        # Warm-up only saves the first requests some latency, so serve anyway.
+        logger.exception("Warm-up failed")
+    else:
+        logger.info("Warm-up complete.")
+    ready.set()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Production logging (log_config.production.json) hands records to a queue;
+    # otherwise fall back to the Rich console for development.
+    start_queue_listeners()
     logging.basicConfig(
         level="INFO",
         format="%(message)s",
         datefmt="[%X]",
         handlers=[RichHandler(rich_tracebacks=True)],
     )
+    if not WARM_UP:
+        ready.set()
+        yield
+        return
+
+    # Warm up off the event loop so that liveness checks are served meanwhile.
+    task = asyncio.create_task(warm_up_in_background())
     yield
+    task.cancel()
 
 
 class GameSettings(CamelModel):
     """Game settings configured at the start of the game."""
 
-    player_word_length: int
+    # Longer words leave too few letters in the deck to deal them quickly.
+    player_word_length: int = Field(ge=2, le=8)
 
 
 class ClueCandidate(CamelModel):
@@ -41,6 +101,11 @@ class ClueCandidate(CamelModel):
     wild: bool
 
 
+class ClueOption(CamelModel):
+    word: str
+    candidate: ClueCandidate
+
+
 class TokenOnWild(CamelModel):
     kind: Literal["wild"] = "wild"
 
@@ -150,13 +215,14 @@ class GameData(CamelModel):
 
 
 class Game:
-    def __init__(self, settings: GameSettings) -> None:
+    def __init__(self, settings: GameSettings, rng: Random | None = None) -> None:
         self.id = coolname.generate_slug(2)
         self.settings = settings
+        self.rng = rng or Random()
         self.players = dict[str, Player]()
         self.npcs = list[Npc]()
         self.phase: Phase = LobbyPhase()
-        self.deck = new_deck()
+        self.deck = new_deck(self.rng)
 
     @property
     def data(self) -> GameData:
@@ -170,15 +236,16 @@ class Game:
 
     async def broadcast(self) -> None:
         logger.info("Broadcasting game data.")
-        for player in self.players.values():
-            if player.socket is None:
-                continue
-            try:
-                await player.socket.send_json(
-                    jsonable_encoder(self.data, exclude_none=True)
-                )
-            except WebSocketDisconnect:
-                logger.info("Skipping player %s due to disconnection", player.name)
+        with profile(f"game:{self.id}:broadcast"):
+            for player in self.players.values():
+                if player.socket is None:
+                    continue
+                try:
+                    await player.socket.send_json(
+                        jsonable_encoder(self.data, exclude_none=True)
+                    )
+                except WebSocketDisconnect:
+                    logger.info("Skipping player %s due to disconnection", player.name)
 
     def top_vote(self) -> str:
         vote_counts = Counter[str](player.vote for player in self.players.values())
@@ -194,26 +261,103 @@ class Game:
             set(english()),
             num_words=len(self.players),
             word_length=self.settings.player_word_length,
+            rng=self.rng,
         )
         for player, word in zip(self.players.values(), secret_words):
             player.secret_word = word
             player.secret_deck = list(word)
-            shuffle(player.secret_deck)
+            self.rng.shuffle(player.secret_deck)
             player.letter = player.secret_deck.pop()
-            logger.info(f"Secret word for player {player.name}: {word}")
+            logger.debug("Secret word for player %s: %s", player.name, word)
 
     def _add_npcs(self) -> None:
         for i in range(6 - len(self.players)):
             npc = Npc(f"NPC {i + 1}")
             self.npcs.append(npc)
             # 1st NPC gets 7 cards, 2nd NPC gets 8 cards, ...
-            npc.secret_deck = [self.deck.pop() for _ in range(7 + i)]
+            npc.secret_deck = [draw(self.deck) for _ in range(7 + i)]
             npc.letter = npc.secret_deck.pop()
 
+    def _letter_tokens(
+        self, clue_giver: Player
+    ) -> dict[str, list[TokenOnPlayer | TokenOnNpc]]:
+        """Tokens for each letter visible to `clue_giver`, players before NPCs."""
+        tokens = dict[str, list[TokenOnPlayer | TokenOnNpc]]()
+        for player in self.players.values():
+            if player is not clue_giver:
+                tokens.setdefault(player.letter, []).append(
+                    TokenOnPlayer(player_name=player.name)
+                )
+        for npc in self.npcs:
+            tokens.setdefault(npc.letter, []).append(TokenOnNpc(npc_name=npc.name))
+        return tokens
+
+    @staticmethod
+    def _spell(
+        word: str, letter_tokens: dict[str, list[TokenOnPlayer | TokenOnNpc]]
+    ) -> Clue:
+        # Repeats of a letter go to different holders while there are any left,
+        # so that as many players as possible are involved.
+        clue: Clue = []
+        repeats = Counter[str]()
+        for letter in word:
+            if holders := letter_tokens.get(letter):
+                clue.append(holders[min(repeats[letter], len(holders) - 1)])
+            else:
+                clue.append(TokenOnWild())
+            repeats[letter] += 1
+        return clue
+
+    def spell_clue(self, clue_giver: Player, word: str) -> Clue:
+        """Spells `word` with the tokens visible to `clue_giver`.
+
+        Each occurrence of a letter goes to a different player holding it if
+        possible, then to an NPC, and otherwise to the wild.
+        """
+        return self._spell(word, self._letter_tokens(clue_giver))
+
+    def clue_options(self, clue_giver: Player, limit: int) -> list[ClueOption]:
+        """Up to `limit` words `clue_giver` can clue, best first.
+
+        Words are spelled as by `spell_clue`. Words involving the most players
+        come first, then the most NPCs, then words not needing the wild, then
+        longer words.
+        """
+        letter_tokens = self._letter_tokens(clue_giver)
+
+        ranked = list[tuple[int, int, bool, str]]()
+        for word in english_index().spellable(letter_tokens, wild=True):
+            players = set[str]()
+            npcs = set[str]()
+            wild = False
+            for token in self._spell(word, letter_tokens):
+                if isinstance(token, TokenOnPlayer):
+                    players.add(token.player_name)
+                elif isinstance(token, TokenOnNpc):
+                    npcs.add(token.npc_name)
+                else:
+                    wild = True
+            ranked.append((len(players), len(npcs), wild, word))
+        ranked.sort(key=lambda r: (-r[0], -r[1], r[2], -len(r[3]), r[3]))
+
+        return [
+            ClueOption(
+                word=word,
+                candidate=ClueCandidate(
+                    length=len(word),
+                    player_count=player_count,
+                    npc_count=npc_count,
+                    wild=wild,
+                ),
+            )
+            for player_count, npc_count, wild, word in ranked[:limit]
+        ]
+
     def start(self) -> None:
-        self._deal_secret_words()
-        self._add_npcs()
-        self.phase = VotePhase()
+        with profile(f"game:{self.id}:start"):
+            self._deal_secret_words()
+            self._add_npcs()
+            self.phase = VotePhase()
 
     def maybe_finish_guess_phase(self) -> None:
         assert isinstance(self.phase, GuessPhase)
@@ -249,7 +393,7 @@ class Game:
                 if player.secret_deck:
                     player.letter = player.secret_deck.pop()
                 else:
-                    player.letter = self.deck.pop()
+                    player.letter = draw(self.deck)
             player.guess_state = ""
             player.vote = ""
 
@@ -259,10 +403,26 @@ class Game:
             if npc.secret_deck:
                 npc.letter = npc.secret_deck.pop()
             else:
-                npc.letter = self.deck.pop()
+                npc.letter = draw(self.deck)
+
+
+class ProfilingMiddleware:
+    """Profiles requests whose path has been armed as a `route:<path>` target."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with profile(f"route:{scope['path']}"):
+            await self.app(scope, receive, send)
 
 
 app = FastAPI(root_url="/api", lifespan=lifespan)
+if ADMIN_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
 
 games = dict[str, Game]()
 
@@ -282,6 +442,57 @@ def game_and_player_or_404(game_id: str, name: str) -> tuple[Game, Player]:
         raise HTTPException(status_code=404, detail="Player not found")
 
 
+@app.get("/healthz")
+async def healthz() -> None:
+    """Liveness check; succeeds as soon as the server is accepting requests."""
+
+
+@app.get("/readyz")
+async def readyz() -> None:
+    """Readiness check; succeeds once startup warm-up has finished."""
+    if not ready.is_set():
+        raise HTTPException(status_code=503, detail="Warming up")
+
+
+def require_admin(x_admin_token: Annotated[str, Header()] = "") -> None:
+    if not ADMIN_TOKEN or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+class ProfileRequest(CamelModel):
+    count: int = Field(default=1, ge=1, le=1000)
+
+
+@app.put("/admin/profile/{target:path}", dependencies=[Depends(require_admin)])
+async def profile_arm(target: str, request: ProfileRequest) -> None:
+    """Profile the next `count` calls to `target`.
+
+    `target` is either `route:<path>` for requests to `<path>`, or
+    `game:<id>:start` / `game:<id>:broadcast` for a game's phases.
+    """
+    profiling.arm(target, request.count)
+
+
+@app.get(
+    "/admin/profile/{target:path}",
+    dependencies=[Depends(require_admin)],
+    response_class=PlainTextResponse,
+)
+async def profile_get(target: str) -> str:
+    """Samples collected so far for `target`, in collapsed-stack format."""
+    if (capture := profiling.capture(target)) is None:
+        raise HTTPException(status_code=404, detail="Target not armed")
+    return capture.collapsed()
+
+
+@app.delete("/admin/profile/{target:path}", dependencies=[Depends(require_admin)])
+async def profile_disarm(target: str) -> None:
+    try:
+        profiling.disarm(target)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Target not armed")
+
+
 @app.get("/game")
 async def game_list() -> list[str]:
     return list(games.keys())
@@ -342,6 +553,17 @@ async def player_delete_clue_candidate(game_id: str, name: str) -> None:
     await game.broadcast()
 
 
+@app.get("/game/{game_id}/player/{name}/clue_options")
+async def player_clue_options(
+    game_id: str, name: str, limit: Annotated[int, Query(ge=1, le=1000)] = 100
+) -> list[ClueOption]:
+    """Words the player can clue with the letters visible to them."""
+    game, player = game_and_player_or_404(game_id, name)
+    if isinstance(game.phase, LobbyPhase):
+        raise HTTPException(status_code=409, detail="Game has not started")
+    return game.clue_options(player, limit)
+
+
 class VoteRequest(CamelModel):
     vote: str
 
@@ -366,7 +588,7 @@ async def game_connect(game_id: str, name: str, socket: WebSocket) -> None:
         await game.broadcast()
         await socket.receive_json()
     except WebSocketDisconnect as e:
-        logger.info(f"Player disconnected: {name}, reason: {e}")
+        logger.info("Player disconnected: %s, reason: %s", name, e)
     finally:
         player.socket = None
         await game.broadcast()
@@ -0,0 +1,93 @@
+import sys
+from collections import Counter
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from threading import Event, Lock, Thread, get_ident
+from types import FrameType
+from typing import Iterator
+
+SAMPLE_INTERVAL = 0.001
+
+_not_profiled = nullcontext()
+
+
+class Capture:
+    """Stack samples collected over a bounded number of profiled calls."""
+
+    def __init__(self, count: int) -> None:
+        self.remaining = count
+        self._lock = Lock()
+        self._stacks = Counter[str]()
+
+    def add(self, stack: str) -> None:
+        with self._lock:
+            self._stacks[stack] += 1
+
+    def collapsed(self) -> str:
+        """Samples in collapsed-stack format, as consumed by flamegraph tools."""
+        with self._lock:
+            return "".join(
+                f"{stack} {count}\n" for stack, count in self._stacks.most_common()
+            )
+
+
+# Target name -> capture. Targets are "route:<path>" for requests and
+# "game:<id>:<method>" for game phases.
+_captures = dict[str, Capture]()
+
+
+def arm(target: str, count: int) -> None:
+    """Profile the next `count` calls to `target`, discarding earlier samples."""
+    if count < 1:
+        raise ValueError("count must be positive")
+    _captures[target] = Capture(count)
+
+
+def capture(target: str) -> Capture | None:
+    return _captures.get(target)
+
+
+def disarm(target: str) -> None:
+    del _captures[target]
+
+
+def _collapse(frame: FrameType) -> str:
+    names = list[str]()
+    current: FrameType | None = frame
+    while current is not None:
+        names.append(f"{current.f_code.co_filename}:{current.f_code.co_qualname}")
+        current = current.f_back
+    return ";".join(reversed(names))
+
+
+@contextmanager
+def _sample(capture: Capture, thread_id: int) -> Iterator[None]:
+    stop = Event()
+
+    def run() -> None:
+        while not stop.wait(SAMPLE_INTERVAL):
+            if frame := sys._current_frames().get(thread_id):
+                capture.add(_collapse(frame))
+
+    sampler = Thread(target=run, name="profiler", daemon=True)
+    sampler.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        sampler.join()
+
+
+def profile(target: str) -> AbstractContextManager[None]:
+    """Samples the current thread's stack if `target` is armed.
+
+    Nothing is armed in normal operation, in which case this is a dict lookup.
+    While profiling a coroutine, samples include whatever else the event loop
+    runs in the meantime.
+    """
+    if not _captures:
+        return _not_profiled
+    capture = _captures.get(target)
+    if capture is None or not capture.remaining:
+        return _not_profiled
+    capture.remaining -= 1
+    return _sample(capture, get_ident())
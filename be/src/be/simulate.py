@@ -0,0 +1,192 @@
+"""Headless simulator playing complete games between scripted bots.
+
+Games are played against `Game` directly, each with its own seeded RNG, so any
+run can be reproduced from the base seed. Example:
+
+    python -m be.simulate --games 10000 --word-lengths 3 4 5 --players 2 4 6
+"""
+
+import logging
+from argparse import ArgumentParser
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+from random import Random
+from time import perf_counter
+from typing import Literal, TypeAlias, get_args
+
+from pydantic import ValidationError
+from rich.console import Console
+from rich.table import Table
+
+from .deck import DeckExhaustedError, NoPossibleCombinationError
+from .main import CluePhase, Game, GameSettings, GuessPhase, Player, TokenOnPlayer
+
+Outcome: TypeAlias = Literal["complete", "deck_exhausted", "deal_failed", "stalled"]
+
+OUTCOMES: tuple[Outcome, ...] = get_args(Outcome)
+
+# NPCs fill the table up to six seats, and a clue needs someone to clue.
+PLAYER_COUNTS = range(2, 7)
+
+
+@dataclass
+class GameResult:
+    word_length: int
+    player_count: int
+    outcome: Outcome
+    rounds: int
+
+
+def play_round(game: Game, round_number: int) -> None:
+    """Plays one vote, clue and guess phase.
+
+    Clue givers take turns, and always give the top-ranked clue option. Every
+    player in the clue moves on to their next letter.
+    """
+    players = list(game.players.values())
+    clue_giver = players[round_number % len(players)]
+    for player in players:
+        player.vote = clue_giver.name
+    assert game.top_vote() == clue_giver.name
+    game.phase = CluePhase(clue_giver=clue_giver.name)
+
+    options = game.clue_options(clue_giver, limit=1)
+    clue = game.spell_clue(clue_giver, options[0].word) if options else []
+    game.phase = GuessPhase(clue=clue)
+    for token in clue:
+        if isinstance(token, TokenOnPlayer):
+            game.players[token.player_name].guess_state = "move_on"
+    game.maybe_finish_guess_phase()
+
+
+def play_game(
+    word_length: int, player_count: int, seed: int, max_rounds: int
+) -> GameResult:
+    game = Game(GameSettings(player_word_length=word_length), rng=Random(seed))
+    for i in range(player_count):
+        game.players[f"Bot {i + 1}"] = Player(f"Bot {i + 1}")
+
+    def result(outcome: Outcome, rounds: int) -> GameResult:
+        return GameResult(word_length, player_count, outcome, rounds)
+
+    try:
+        game.start()
+    except NoPossibleCombinationError:
+        return result("deal_failed", 0)
+    except DeckExhaustedError:
+        return result("deck_exhausted", 0)
+
+    for round_number in range(max_rounds):
+        # A game is complete once every player has seen every letter of their word.
+        if not any(player.secret_deck for player in game.players.values()):
+            return result("complete", round_number)
+        try:
+            play_round(game, round_number)
+        except DeckExhaustedError:
+            return result("deck_exhausted", round_number + 1)
+    return result("stalled", max_rounds)
+
+
+def _play_games(jobs: list[tuple[int, int, int, int]]) -> list[GameResult]:
+    return [play_game(*job) for job in jobs]
+
+
+def simulate(
+    games: int,
+    word_lengths: list[int],
+    player_counts: list[int],
+    seed: int,
+    max_rounds: int,
+    workers: int | None,
+    chunk_size: int,
+) -> list[GameResult]:
+    """Plays `games` games for each word length and player count."""
+    # Seeds are drawn up front so results don't depend on scheduling.
+    rng = Random(seed)
+    jobs = [
+        (word_length, player_count, rng.getrandbits(64), max_rounds)
+        for word_length, player_count in product(word_lengths, player_counts)
+        for _ in range(games)
+    ]
+    chunks = [jobs[i : i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    with ProcessPoolExecutor(workers) as executor:
+        return [
+            result for chunk in executor.map(_play_games, chunks) for result in chunk
+        ]
+
+
+def report(results: list[GameResult], elapsed: float, console: Console) -> None:
+    outcomes = defaultdict[tuple[int, int], Counter[Outcome]](Counter)
+    rounds = Counter[tuple[int, int]]()
+    for result in results:
+        key = (result.word_length, result.player_count)
+        outcomes[key][result.outcome] += 1
+        if result.outcome == "complete":
+            rounds[key] += result.rounds
+
+    table = Table(title=f"{len(results) / elapsed:.1f} games/sec")
+    table.add_column("Word length", justify="right")
+    table.add_column("Players", justify="right")
+    table.add_column("Games", justify="right")
+    for outcome in OUTCOMES:
+        table.add_column(outcome.replace("_", " ").capitalize(), justify="right")
+    table.add_column("Rounds to complete", justify="right")
+    for (word_length, player_count), counts in sorted(outcomes.items()):
+        total = counts.total()
+        completed = counts["complete"]
+        key = (word_length, player_count)
+        table.add_row(
+            str(word_length),
+            str(player_count),
+            str(total),
+            *(f"{counts[outcome] / total:.1%}" for outcome in OUTCOMES),
+            f"{rounds[key] / completed:.1f}" if completed else "-",
+        )
+    console.print(table)
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Play games between scripted bots.")
+    parser.add_argument(
+        "--games", type=int, default=1000, help="Games per configuration."
+    )
+    parser.add_argument("--word-lengths", type=int, nargs="+", default=[3, 4, 5])
+    parser.add_argument("--players", type=int, nargs="+", default=[2, 3, 4, 5, 6])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-rounds", type=int, default=100)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Defaults to the CPU count."
+    )
+    parser.add_argument("--chunk-size", type=int, default=50)
+    args = parser.parse_args()
+    for word_length in args.word_lengths:
+        try:
+            GameSettings(player_word_length=word_length)
+        except ValidationError as e:
+            parser.error(f"invalid word length {word_length}: {e}")
+    for player_count in args.players:
+        if player_count not in PLAYER_COUNTS:
+            parser.error(
+                f"invalid player count {player_count}: must be between "
+                f"{PLAYER_COUNTS.start} and {PLAYER_COUNTS.stop - 1}"
+            )
+
+    # Game logs every deal and broadcast; keep the report readable.
+    logging.basicConfig(level="WARNING")
+    start = perf_counter()
+    results = simulate(
+        games=args.games,
+        word_lengths=args.word_lengths,
+        player_counts=args.players,
+        seed=args.seed,
+        max_rounds=args.max_rounds,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
+    report(results, perf_counter() - start, Console())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+from be.clue import ClueIndex, english_index, letter_mask
+from be.corpus import english
+
+
+def test_letter_mask() -> None:
+    assert letter_mask("") == 0
+    assert letter_mask("A") == 1
+    assert letter_mask("ABBA") == 0b11
+    assert letter_mask("Z?*") == 1 << 25
+
+
+def test_spellable_reuses_letters() -> None:
+    index = ClueIndex(["CAT", "TACT", "DOG", "AT"])
+    assert set(index.spellable("CAT")) == {"CAT", "TACT", "AT"}
+
+
+def test_spellable_ignores_unknown_letters() -> None:
+    index = ClueIndex(["CAT", "DOG"])
+    assert set(index.spellable(["C", "A", "T", "?"])) == {"CAT"}
+
+
+def test_spellable_wild() -> None:
+    index = ClueIndex(["CAT", "COT", "DOG", "COAT"])
+    assert set(index.spellable("CT")) == set()
+    assert set(index.spellable("CT", wild=True)) == {"CAT", "COT"}
+    assert set(index.spellable("CAT", wild=True)) == {"CAT", "COT", "COAT"}
+
+
+def test_spellable_matches_scan() -> None:
+    """Index lookups agree with a brute-force scan of the corpus."""
+    for letters in ["", "E", "TRSEA", "ABCDEFGHIJKLMNOPQRST"]:
+        for wild in [False, True]:
+            expected = {
+                word for word in english() if len(set(word) - set(letters)) <= wild
+            }
+            assert set(english_index().spellable(letters, wild=wild)) == expected
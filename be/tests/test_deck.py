@@ -1,14 +1,28 @@
-from random import shuffle
+from random import Random, shuffle
 
 from pytest import raises
 
-from be.deck import NoPossibleCombinationError, deal_words, new_deck
+from be.deck import (
+    DeckExhaustedError,
+    NoPossibleCombinationError,
+    deal_words,
+    draw,
+    new_deck,
+)
 
 
 def test_deck_size() -> None:
     assert len(new_deck()) == 64
 
 
+def test_draw() -> None:
+    deck = list("AB")
+    assert draw(deck) == "B"
+    assert draw(deck) == "A"
+    with raises(DeckExhaustedError):
+        draw(deck)
+
+
 def test_deal_words_pops_deck() -> None:
     deck = list("CATDOGXYZCAR")
     shuffle(deck)
@@ -31,3 +45,22 @@ def test_deal_words_duplicate_letters() -> None:
     deck = list("XXX")
     corpus = {"XX"}
     assert deal_words(deck, corpus, num_words=1, word_length=2) == ["XX"]
+
+
+def test_seeded_deal_is_reproducible() -> None:
+    corpus = {"CAT", "DOG", "BAT", "RAT", "COG", "HAT"}
+    deals = list[list[str]]()
+    for _ in range(2):
+        deck = new_deck(Random(1234))
+        deals.append(deck + deal_words(deck, corpus, 2, 3, rng=Random(1234)))
+    assert deals[0] == deals[1]
+
+
+def test_deal_words_prunes_impossible_prefixes() -> None:
+    # None of the words containing Z can be dealt, and there are far too many
+    # combinations of them to try one by one.
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    corpus = {f"Z{a}{b}" for a in letters for b in letters} | {"CAT", "DOG", "EEL"}
+    deck = list("CATDOGEELXY")
+    words = deal_words(deck, corpus, num_words=3, word_length=3)
+    assert set(words) == {"CAT", "DOG", "EEL"}
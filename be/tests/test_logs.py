@@ -0,0 +1,133 @@
+import json
+import logging
+import logging.config
+import sys
+from io import StringIO
+from pathlib import Path
+from typing import Iterator
+
+from pytest import LogCaptureFixture, MonkeyPatch, fixture
+
+from be.logs import (
+    JsonFormatter,
+    RateLimitFilter,
+    start_queue_listeners,
+    stop_queue_listeners,
+)
+
+
+def make_record(
+    msg: str, name: str = "be.main", level: int = logging.INFO
+) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 0, msg, (), None)
+
+
+def test_json_formatter() -> None:
+    record = logging.LogRecord(
+        "be.main", logging.INFO, __file__, 0, "Player %s joined", ("A",), None
+    )
+    line = JsonFormatter().format(record)
+    assert "\n" not in line
+
+    entry = json.loads(line)
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "be.main"
+    assert entry["message"] == "Player A joined"
+
+
+def test_json_formatter_exception() -> None:
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord(
+            "be.main", logging.ERROR, __file__, 0, "Failed", (), sys.exc_info()
+        )
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert "ValueError: boom" in entry["exception"]
+
+
+def test_json_formatter_stack() -> None:
+    stack = 'Stack (most recent call last):\n  File "x.py", line 1, in f'
+    record = logging.LogRecord(
+        "be.main", logging.INFO, __file__, 0, "Slow", (), None, sinfo=stack
+    )
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["stack"] == stack
+
+
+def test_rate_limit(monkeypatch: MonkeyPatch, caplog: LogCaptureFixture) -> None:
+    now = 0.0
+    monkeypatch.setattr("be.logs.monotonic", lambda: now)
+    rate_limit = RateLimitFilter(burst=2, period=1.0)
+
+    assert [rate_limit.filter(make_record("hot")) for _ in range(4)] == [
+        True,
+        True,
+        False,
+        False,
+    ]
+    # Other messages are limited independently.
+    assert rate_limit.filter(make_record("cold"))
+    assert caplog.messages == []
+
+    # Once the window has ended, the next record of any kind reports the drops.
+    now = 1.0
+    assert rate_limit.filter(make_record("cold"))
+    assert caplog.messages == ["Dropped 2 repeats of 'hot'"]
+
+
+def test_rate_limit_other_loggers() -> None:
+    rate_limit = RateLimitFilter("be", burst=1)
+    assert rate_limit.filter(make_record("hot", name="be.main"))
+    assert not rate_limit.filter(make_record("hot", name="be.main"))
+    assert all(rate_limit.filter(make_record("hot", name="uvicorn")) for _ in range(3))
+
+
+def test_rate_limit_max_level() -> None:
+    rate_limit = RateLimitFilter(burst=1, max_level="INFO")
+    assert rate_limit.filter(make_record("hot"))
+    assert not rate_limit.filter(make_record("hot"))
+    assert all(
+        rate_limit.filter(make_record("hot", level=logging.WARNING)) for _ in range(3)
+    )
+
+
+@fixture
+def production_logging() -> Iterator[StringIO]:
+    """Applies log_config.production.json with its output redirected, restoring
+    the root logger afterwards."""
+    with (Path(__file__).parent.parent / "log_config.production.json").open() as f:
+        config = json.load(f)
+    output = StringIO()
+    config["handlers"]["stdout"]["stream"] = output
+
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    logging.config.dictConfig(config)
+    start_queue_listeners()
+    yield output
+    stop_queue_listeners()
+    root.handlers, root.level = handlers, level
+
+
+def test_production_config(production_logging: StringIO) -> None:
+    logger = logging.getLogger("be.test")
+    for i in range(15):
+        logger.info("Broadcasting %d", i)
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        for i in range(15):
+            logger.exception("Failed %d", i)
+    logger.warning("Slow", stack_info=True)
+    stop_queue_listeners()
+
+    entries = [json.loads(line) for line in production_logging.getvalue().splitlines()]
+    infos = [entry for entry in entries if entry["level"] == "INFO"]
+    errors = [entry for entry in entries if entry["level"] == "ERROR"]
+    assert len(infos) == 10
+    assert len(errors) == 15
+    assert errors[0]["message"] == "Failed 0"
+    assert "ZeroDivisionError" in errors[0]["exception"]
+    assert "test_production_config" in entries[-1]["stack"]
@@ -1,16 +1,23 @@
+import asyncio
+from time import sleep
 from typing import TypeVar, cast
 
 from fastapi.testclient import TestClient
-from pytest import raises
+from pytest import LogCaptureFixture, MonkeyPatch, fail, raises
 from starlette.websockets import WebSocketDisconnect
 
 from be.main import (
     ClueCandidate,
+    ClueOption,
     CluePhase,
+    Game,
     GameData,
     GameSettings,
     LobbyPhase,
+    Player,
     PlayerData,
+    TokenOnPlayer,
+    TokenOnWild,
     VotePhase,
     app,
 )
@@ -224,3 +231,162 @@ def test_vote() -> None:
         clue_phase = get_game(game.id).phase
         assert isinstance(clue_phase, CluePhase)
         assert clue_phase.clue_giver == "B"
+
+
+def test_clue_options() -> None:
+    game = new_game()
+    add_player(game.id, "A")
+    add_player(game.id, "B")
+
+    with (
+        client.websocket_connect(f"/game/{game.id}/player/A"),
+        client.websocket_connect(f"/game/{game.id}/player/B"),
+    ):
+        assert client.post(f"/game/{game.id}/start").status_code == 200
+        data = get_game(game.id)
+        visible = {data.players[1].letter} | {npc.letter for npc in data.npcs}
+
+        response = client.get(f"/game/{game.id}/player/A/clue_options?limit=50")
+        assert response.status_code == 200
+        options = [ClueOption(**option) for option in response.json()]
+
+    assert 0 < len(options) <= 50
+    for option in options:
+        assert len(set(option.word) - visible) <= 1
+        assert option.candidate.length == len(option.word)
+        assert option.candidate.wild == bool(set(option.word) - visible)
+    assert [o.candidate.player_count for o in options] == sorted(
+        (o.candidate.player_count for o in options), reverse=True
+    )
+
+
+def test_clue_options_nonexistent_player() -> None:
+    game = new_game()
+    response = client.get(f"/game/{game.id}/player/A/clue_options")
+    assert response.status_code == 404
+
+
+def test_clue_options_lobby() -> None:
+    """No letters have been dealt before the game starts."""
+    game = new_game()
+    add_player(game.id, "A")
+    response = client.get(f"/game/{game.id}/player/A/clue_options")
+    assert response.status_code == 409
+
+
+def test_clue_options_shared_letter() -> None:
+    """Repeats of a letter are spread across the players holding it."""
+    game = Game(GameSettings(player_word_length=3))
+    for name, letter in zip("ABC", "?EE"):
+        game.players[name] = Player(name)
+        game.players[name].letter = letter
+    clue_giver = game.players["A"]
+
+    options = {o.word: o.candidate for o in game.clue_options(clue_giver, 1000)}
+    assert options["BEE"] == ClueCandidate(
+        length=3, player_count=2, npc_count=0, wild=True
+    )
+    assert game.spell_clue(clue_giver, "BEE") == [
+        TokenOnWild(),
+        TokenOnPlayer(player_name="B"),
+        TokenOnPlayer(player_name="C"),
+    ]
+
+
+def test_healthz() -> None:
+    assert client.get("/healthz").status_code == 200
+
+
+def test_readyz_after_warm_up() -> None:
+    # Entering the client context runs the lifespan, which starts warm-up.
+    with TestClient(app) as warm_client:
+        for _ in range(100):
+            if warm_client.get("/readyz").status_code == 200:
+                break
+            sleep(0.1)
+        else:
+            fail("Server did not become ready")
+
+
+def test_profile_requires_admin(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr("be.main.ADMIN_TOKEN", "")
+    response = client.put("/admin/profile/route:/game", json={"count": 1})
+    assert response.status_code == 403
+
+    monkeypatch.setattr("be.main.ADMIN_TOKEN", "secret")
+    response = client.put(
+        "/admin/profile/route:/game",
+        json={"count": 1},
+        headers={"X-Admin-Token": "wrong"},
+    )
+    assert response.status_code == 403
+
+
+def test_profile_invalid_count(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr("be.main.ADMIN_TOKEN", "secret")
+    for count in (-1, 0, 1001):
+        response = client.put(
+            "/admin/profile/route:/game",
+            json={"count": count},
+            headers={"X-Admin-Token": "secret"},
+        )
+        assert response.status_code == 422
+
+
+def test_profile_game_start(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr("be.main.ADMIN_TOKEN", "secret")
+    headers = {"X-Admin-Token": "secret"}
+    game = new_game()
+    add_player(game.id, "A")
+    add_player(game.id, "B")
+    target = f"/admin/profile/game:{game.id}:start"
+
+    assert client.get(target, headers=headers).status_code == 404
+    assert client.put(target, json={"count": 1}, headers=headers).status_code == 200
+
+    with (
+        client.websocket_connect(f"/game/{game.id}/player/A"),
+        client.websocket_connect(f"/game/{game.id}/player/B"),
+    ):
+        assert client.post(f"/game/{game.id}/start").status_code == 200
+
+    response = client.get(target, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "Game.start" in response.text
+
+    assert client.delete(target, headers=headers).status_code == 200
+    assert client.get(target, headers=headers).status_code == 404
+
+
+def test_clue_options_invalid_limit() -> None:
+    game = new_game()
+    add_player(game.id, "A")
+    for limit in (-1, 0, 1001):
+        response = client.get(f"/game/{game.id}/player/A/clue_options?limit={limit}")
+        assert response.status_code == 422
+
+
+def test_readyz_after_failed_warm_up(
+    monkeypatch: MonkeyPatch, caplog: LogCaptureFixture
+) -> None:
+    def fail_warm_up() -> None:
+        raise RuntimeError("corpus unavailable")
+
+    monkeypatch.setattr("be.main.warm_up", fail_warm_up)
+    monkeypatch.setattr("be.main.ready", asyncio.Event())
+    with TestClient(app) as warm_client:
+        for _ in range(100):
+            if warm_client.get("/readyz").status_code == 200:
+                break
+            sleep(0.1)
+        else:
+            fail("Server did not become ready")
+
+    assert "Warm-up failed" in caplog.messages
+
+
+def test_new_game_invalid_word_length() -> None:
+    for length in (1, 9):
+        response = client.post("/game", json={"playerWordLength": length})
+        assert response.status_code == 422
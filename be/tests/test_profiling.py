@@ -0,0 +1,63 @@
+from time import monotonic
+
+from pytest import fixture, raises
+
+from be import profiling
+from be.profiling import arm, capture, disarm, profile
+
+
+@fixture(autouse=True)
+def clear_captures() -> None:
+    profiling._captures.clear()
+
+
+def busy_wait(seconds: float) -> None:
+    deadline = monotonic() + seconds
+    while monotonic() < deadline:
+        pass
+
+
+def test_not_armed() -> None:
+    with profile("game:foo:start"):
+        busy_wait(0.01)
+    assert capture("game:foo:start") is None
+
+
+def test_profile_armed_target() -> None:
+    arm("game:foo:start", count=1)
+    with profile("game:foo:start"):
+        busy_wait(0.05)
+    with profile("game:bar:start"):
+        busy_wait(0.05)
+
+    captured = capture("game:foo:start")
+    assert captured is not None
+    lines = captured.collapsed().splitlines()
+    assert lines
+    for line in lines:
+        _, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+    assert any("busy_wait" in line for line in lines)
+    assert capture("game:bar:start") is None
+
+
+def test_profile_count() -> None:
+    arm("route:/game", count=2)
+    captured = capture("route:/game")
+    assert captured is not None
+    for _ in range(3):
+        with profile("route:/game"):
+            pass
+    assert captured.remaining == 0
+
+
+def test_arm_invalid_count() -> None:
+    with raises(ValueError):
+        arm("route:/game", count=0)
+    assert capture("route:/game") is None
+
+
+def test_disarm() -> None:
+    arm("route:/game", count=1)
+    disarm("route:/game")
+    assert capture("route:/game") is None
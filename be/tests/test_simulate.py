@@ -0,0 +1,74 @@
+import logging
+
+from pytest import LogCaptureFixture, MonkeyPatch, raises
+from rich.console import Console
+
+from be.main import Game
+from be.simulate import GameResult, main, play_game, report
+
+
+def test_play_game_completes() -> None:
+    result = play_game(word_length=3, player_count=4, seed=1, max_rounds=100)
+    assert result.outcome == "complete"
+    assert result.rounds > 0
+
+
+def test_play_game_is_reproducible(caplog: LogCaptureFixture) -> None:
+    caplog.set_level(logging.DEBUG, logger="be.main")
+    play_game(word_length=4, player_count=3, seed=1234, max_rounds=100)
+    first = caplog.messages
+    assert any(message.startswith("Secret word") for message in first)
+    caplog.clear()
+    play_game(word_length=4, player_count=3, seed=1234, max_rounds=100)
+    assert caplog.messages == first
+
+
+def test_play_game_deal_failed(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr("be.main.english", lambda: [])
+    result = play_game(word_length=3, player_count=2, seed=1, max_rounds=100)
+    assert result.outcome == "deal_failed"
+
+
+def test_play_game_deck_exhausted(monkeypatch: MonkeyPatch) -> None:
+    # Enough letters for the secret words, but none left for the NPCs.
+    monkeypatch.setattr("be.main.english", lambda: ["CAT", "DOG"])
+    monkeypatch.setattr("be.main.new_deck", lambda rng: list("CATDOG"))
+    result = play_game(word_length=3, player_count=2, seed=1, max_rounds=100)
+    assert result.outcome == "deck_exhausted"
+
+
+def test_play_game_propagates_other_errors(monkeypatch: MonkeyPatch) -> None:
+    def top_vote(self: Game) -> str:
+        return [][0]
+
+    monkeypatch.setattr(Game, "top_vote", top_vote)
+    with raises(IndexError):
+        play_game(word_length=3, player_count=2, seed=1, max_rounds=100)
+
+
+def test_report() -> None:
+    console = Console(record=True, width=200)
+    report(
+        [
+            GameResult(3, 2, "complete", 4),
+            GameResult(3, 2, "deck_exhausted", 7),
+        ],
+        elapsed=1.0,
+        console=console,
+    )
+    text = console.export_text()
+    assert "2.0 games/sec" in text
+    assert "50.0%" in text
+
+
+def test_main_rejects_invalid_player_counts(monkeypatch: MonkeyPatch) -> None:
+    for player_count in ("0", "1", "7"):
+        monkeypatch.setattr("sys.argv", ["simulate", "--players", player_count])
+        with raises(SystemExit):
+            main()
+
+
+def test_main_rejects_invalid_word_lengths(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr("sys.argv", ["simulate", "--word-lengths", "9"])
+    with raises(SystemExit):
+        main()